@@ -1,3 +1,5 @@
 from .board import Board
 from .board_fetcher import get_random_puzzle, download_puzzle, get_local_puzzle
 from .solver import solve
+from .cache import SolutionCache, solve_cached
+from .hints import Hint, HintSession
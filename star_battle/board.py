@@ -24,6 +24,19 @@ def colored(s, color):
 red = partial(colored, color=bcolors.FAIL)
 
 
+# the 8 symmetries of the square, mapping (row, col) on an n x n board to its transformed position
+SYMMETRIES = [
+    lambda i, j, n: (i, j),  # identity
+    lambda i, j, n: (j, n - 1 - i),  # rotate 90 clockwise
+    lambda i, j, n: (n - 1 - i, n - 1 - j),  # rotate 180
+    lambda i, j, n: (n - 1 - j, i),  # rotate 270 clockwise
+    lambda i, j, n: (i, n - 1 - j),  # mirror left / right
+    lambda i, j, n: (n - 1 - i, j),  # mirror top / bottom
+    lambda i, j, n: (j, i),  # transpose
+    lambda i, j, n: (n - 1 - j, n - 1 - i),  # anti-transpose
+]
+
+
 @dataclass(frozen=True)
 class Cell:
     lb: bool = False
@@ -257,6 +270,32 @@ class Board:
     def area_for_cell(self, row, col):
         return self._area_lookup[(row, col)]
 
+    def _layout_under(self, transform):
+        """Area layout after applying a symmetry, areas relabeled in order of first appearance"""
+
+        area_index = {a: k for k, a in enumerate(self.areas)}
+        grid = [[None] * self.size for _ in range(self.size)]
+        for i, j in self.cell_index_iter:
+            r, c = transform(i, j, self.size)
+            grid[r][c] = area_index[self.area_for_cell(i, j)]
+
+        labels = {}
+        for label in itertools.chain.from_iterable(grid):
+            labels.setdefault(label, chr(ord("A") + len(labels)))
+
+        return "".join(labels[label] for label in itertools.chain.from_iterable(grid))
+
+    def canonical_form(self):
+        """Get the canonical layout string among all symmetries, and the symmetry that produces it
+
+        Boards which are rotations / reflections of each other share the same canonical layout.
+        """
+
+        return min(
+            ((self._layout_under(t), t) for t in SYMMETRIES),
+            key=lambda pair: pair[0],
+        )
+
     def check_solution(self, candidate):
         for i, j in self.cell_index_iter:
             assert candidate[i][j] == self.solution[i][j], "Incorrect solution"
@@ -0,0 +1,89 @@
+from collections import OrderedDict
+import json
+import os
+from pathlib import Path
+
+from .solver import Solution, solve
+
+
+class SolutionCache:
+    """LRU cache of solutions keyed by canonical board layout, optionally persisted to disk
+
+    Solutions are stored in canonical coordinates, so a board that is a rotation or reflection of
+    a cached one is a hit too. The file is only written on put, so recency from hits since the
+    last put isn't persisted.
+    """
+
+    def __init__(self, path=None, max_size=1024):
+        self._path = Path(path) if path else None
+        self._max_size = max_size
+        self._entries = OrderedDict()
+
+        if self._path and self._path.exists():
+            with open(self._path) as f:
+                self._entries.update((k, [tuple(c) for c in v]) for k, v in json.load(f))
+            self._evict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _key(board, layout):
+        return f"{board.stars}:{layout}"
+
+    def get(self, board):
+        """Get the cached solution for board, or None if not cached"""
+
+        layout, transform = board.canonical_form()
+        key = self._key(board, layout)
+        if key not in self._entries:
+            return None
+
+        self._entries.move_to_end(key)
+        stars = set(self._entries[key])
+
+        # map back from canonical coordinates through the transform
+        solution = Solution(board)
+        for i, j in board.cell_index_iter:
+            solution[i][j] = transform(i, j, board.size) in stars
+
+        return solution
+
+    def put(self, board, solution):
+        layout, transform = board.canonical_form()
+        key = self._key(board, layout)
+
+        self._entries[key] = [
+            transform(i, j, board.size) for i, j in board.cell_index_iter if solution[i][j]
+        ]
+        self._entries.move_to_end(key)
+        self._evict()
+        self._save()
+
+    def _evict(self):
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def _save(self):
+        if not self._path:
+            return
+
+        # write then swap so a crash never leaves a partial cache behind
+        tmp = self._path.with_suffix(self._path.suffix + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(list(self._entries.items()), f)
+        os.replace(tmp, self._path)
+
+
+def solve_cached(board, cache):
+    """Solve a board, consulting and populating the cache"""
+
+    solution = cache.get(board)
+    if solution is not None:
+        return solution
+
+    solution = solve(board)
+    if solution is not None:
+        cache.put(board, solution)
+
+    return solution
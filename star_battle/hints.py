@@ -0,0 +1,380 @@
+from collections import Counter, deque
+from dataclasses import dataclass
+import itertools
+
+from .solver import Solution
+
+
+@dataclass(frozen=True)
+class Hint:
+    row: int
+    col: int
+    value: bool
+    rule: str
+    # set when the hint names a user placement the rules contradict
+    conflict: bool = False
+
+
+@dataclass(frozen=True)
+class _Reason:
+    value: bool
+    rule: str
+    # user placed cells this deduction (transitively) relies on
+    support: frozenset
+
+
+@dataclass(frozen=True)
+class _Placement:
+    """One way to put an area's stars, ignoring everything outside the area"""
+
+    cells: frozenset
+    # (axis, line, count) for every line receiving stars, and those receiving more than one
+    lines: tuple
+    multi: tuple
+    # cells outside the area touching the stars
+    halo: frozenset
+
+
+class HintSession:
+    """Live solution state for interactive play
+
+    Every known cell remembers the rule that set it and the user placements it depends on, so
+    placements only re-propagate the units they touch and removals retract just the deductions
+    that relied on them. Deductions are made eagerly in place / remove, so hint only reads them
+    back; the cost of propagating a change is paid by place / remove.
+    """
+
+    def __init__(self, board):
+        self._board = board
+        self._solution = Solution(board)
+        self._reasons = {}
+        self._user = {}
+        self._conflicts = []
+
+        # units are (kind, cells), with per cell / per line lookups of the unit ids touching them
+        self._units = (
+            [("row", [(r, c) for c in range(board.size)]) for r in range(board.size)]
+            + [("column", [(r, c) for r in range(board.size)]) for c in range(board.size)]
+            + [("area", sorted(a)) for a in board.areas]
+        )
+        area_ids = {a: 2 * board.size + k for k, a in enumerate(board.areas)}
+        self._cell_units = {
+            (i, j): (i, board.size + j, area_ids[board.area_for_cell(i, j)])
+            for i, j in board.cell_index_iter
+        }
+        self._line_areas = {}
+        for i, j in board.cell_index_iter:
+            area_id = area_ids[board.area_for_cell(i, j)]
+            self._line_areas.setdefault(("row", i), set()).add(area_id)
+            self._line_areas.setdefault(("column", j), set()).add(area_id)
+        self._neighbors = {
+            (i, j): [
+                (i + x, j + y)
+                for x, y in itertools.product(range(-1, 2), range(-1, 2))
+                if (x or y) and board.is_valid_cell(i + x, j + y)
+            ]
+            for i, j in board.cell_index_iter
+        }
+
+        # candidate placements per area, narrowed as cells become known and reset on retraction
+        self._placements = {
+            area_id: self._area_placements(area) for area, area_id in area_ids.items()
+        }
+        self._live = dict(self._placements)
+        # per area, the cells outside of it in each row / col it spans
+        self._area_lines = {
+            area_id: tuple(
+                {
+                    line: frozenset(
+                        self._units[line if axis == 0 else board.size + line][1]
+                    ).difference(area)
+                    for line in {c[axis] for c in area}
+                }
+                for axis in (0, 1)
+            )
+            for area, area_id in area_ids.items()
+        }
+
+        self._stars_queue = deque()
+        self._units_queue = deque()
+        self._queued_units = set()
+
+        self._apply_contained()
+        for unit_id in range(len(self._units)):
+            self._queue_unit(unit_id)
+        self._propagate()
+
+    @property
+    def solution(self):
+        """Copy of the current state, eg. for Board.draw_solution_with_ruled_out"""
+
+        return self._solution.copy()
+
+    @property
+    def conflicts(self):
+        """Cells where the rules contradict the current state, as (row, col, rule)"""
+
+        return [(i, j, rule) for (i, j), rule, _ in self._conflicts]
+
+    @property
+    def placements(self):
+        """Cells placed by the user, as {(row, col): value}"""
+
+        return dict(self._user)
+
+    def place(self, row, col, value=True):
+        """Place a star (or mark a cell empty with value=False) as the user"""
+
+        cell = (row, col)
+        known = self._solution[row][col]
+        if known is not None and known != value:
+            raise ValueError(f"Cell {cell} is already {known} by rule '{self._reasons[cell].rule}'")
+
+        self._user[cell] = value
+        if known is None:
+            self._set(cell, value, "user", frozenset([cell]))
+            self._propagate()
+
+    def remove(self, row, col):
+        """Undo a user placement, retracting every deduction that depended on it"""
+
+        cell = (row, col)
+        if cell not in self._user:
+            raise ValueError(f"Cell {cell} was not placed by the user")
+
+        del self._user[cell]
+        self._conflicts = [c for c in self._conflicts if cell not in c[2]]
+
+        dropped = [c for c, reason in self._reasons.items() if cell in reason.support]
+        for i, j in dropped:
+            del self._reasons[(i, j)]
+            self._solution[i][j] = None
+
+        # still standing placements / deductions may now re-derive what was dropped
+        for i, j in dropped:
+            for area_id in self._line_areas[("row", i)] | self._line_areas[("column", j)]:
+                self._live[area_id] = self._placements[area_id]
+            if (i, j) in self._user:
+                self._set((i, j), self._user[(i, j)], "user", frozenset([(i, j)]))
+            for n in self._neighbors[(i, j)]:
+                if self._solution[n[0]][n[1]]:
+                    self._stars_queue.append(n)
+            self._queue_units_for((i, j))
+
+        self._propagate()
+
+    def hint(self):
+        """Get the next thing to tell the user, or None if the rules are stuck
+
+        A contradiction is reported first, naming the latest user placement it depends on.
+        Otherwise the newest deduced star is preferred over the newest deduced empty cell.
+        """
+
+        if self._conflicts:
+            cell, rule, support = self._conflicts[-1]
+            placed = [c for c in self._user if c in support]
+            if placed:
+                cell = placed[-1]
+            return Hint(*cell, self._solution[cell[0]][cell[1]], rule, conflict=True)
+
+        fallback = None
+        for cell, reason in reversed(self._reasons.items()):
+            if cell in self._user:
+                continue
+            if reason.value:
+                return Hint(*cell, reason.value, reason.rule)
+            if fallback is None:
+                fallback = Hint(*cell, reason.value, reason.rule)
+
+        return fallback
+
+    # state updates
+
+    def _set(self, cell, value, rule, support):
+        i, j = cell
+        known = self._solution[i][j]
+        if known is not None:
+            if known != value:
+                self._conflict(cell, rule, support | self._reasons[cell].support)
+            return
+
+        self._solution[i][j] = value
+        self._reasons[cell] = _Reason(value, rule, support)
+        if value:
+            self._stars_queue.append(cell)
+        self._queue_units_for(cell)
+
+    def _conflict(self, cell, rule, support):
+        # units are rechecked as neighbors change, only record each contradiction once
+        if (cell, rule, support) not in self._conflicts:
+            self._conflicts.append((cell, rule, support))
+
+    def _queue_unit(self, unit_id):
+        if unit_id not in self._queued_units:
+            self._queued_units.add(unit_id)
+            self._units_queue.append(unit_id)
+
+    def _queue_units_for(self, cell):
+        i, j = cell
+        for unit_id in self._cell_units[cell]:
+            self._queue_unit(unit_id)
+
+        # areas crossing this row / col may now be confined to it or lose placements
+        for unit_id in self._line_areas[("row", i)] | self._line_areas[("column", j)]:
+            self._queue_unit(unit_id)
+
+    def _support(self, cells):
+        return frozenset().union(*(self._reasons[c].support for c in cells))
+
+    # rules
+
+    def _apply_contained(self):
+        """Static eliminations from rows / cols entirely contained in an area"""
+
+        for kind, cells in self._units[: 2 * self._board.size]:
+            areas = {self._board.area_for_cell(*c) for c in cells}
+            if len(areas) == 1:
+                for c in areas.pop().difference(cells):
+                    self._set(c, False, f"{kind} inside area", frozenset())
+
+    def _propagate(self):
+        while self._stars_queue or self._units_queue:
+            while self._stars_queue:
+                cell = self._stars_queue.popleft()
+                support = self._reasons[cell].support
+                for n in self._neighbors[cell]:
+                    self._set(n, False, "adjacent to star", support)
+
+            if self._units_queue:
+                unit_id = self._units_queue.popleft()
+                self._queued_units.discard(unit_id)
+                self._check_unit(unit_id)
+
+    def _check_unit(self, unit_id):
+        kind, cells = self._units[unit_id]
+        stars = [c for c in cells if self._solution[c[0]][c[1]]]
+        unknown = [c for c in cells if self._solution[c[0]][c[1]] is None]
+        needed = self._board.stars - len(stars)
+
+        if needed > len(unknown):
+            support = self._support(c for c in cells if c not in unknown)
+            self._conflict(cells[0], f"{kind} cannot fit its stars", support)
+            return
+
+        if not unknown:
+            return
+
+        if needed == 0:
+            support = self._support(stars)
+            for c in unknown:
+                self._set(c, False, f"{kind} full", support)
+        elif needed == len(unknown):
+            support = self._support(c for c in cells if c not in unknown)
+            for c in unknown:
+                self._set(c, True, f"{kind} needs remaining cells", support)
+        elif kind == "area":
+            self._check_area_in_line(cells, unknown, needed)
+            self._check_placements(unit_id, cells, stars, unknown)
+
+    def _check_area_in_line(self, area, unknown, needed):
+        """An area confined to one row / col takes all of that line's remaining stars"""
+
+        for axis, kind in enumerate(("row", "column")):
+            lines = {c[axis] for c in unknown}
+            if len(lines) != 1:
+                continue
+
+            line = lines.pop()
+            unit_id = line if axis == 0 else self._board.size + line
+            line_cells = self._units[unit_id][1]
+            line_stars = [c for c in line_cells if self._solution[c[0]][c[1]]]
+            if len(line_stars) + needed != self._board.stars:
+                continue
+
+            support = self._support(c for c in area if c not in unknown) | self._support(line_stars)
+            for c in line_cells:
+                if c not in area and self._solution[c[0]][c[1]] is None:
+                    self._set(c, False, f"area confined to {kind}", support)
+
+    def _area_placements(self, area):
+        """All ways to put the area's stars without any two touching"""
+
+        placements = []
+        for combo in itertools.combinations(sorted(area), self._board.stars):
+            if any(
+                abs(a[0] - b[0]) <= 1 and abs(a[1] - b[1]) <= 1
+                for a, b in itertools.combinations(combo, 2)
+            ):
+                continue
+
+            lines = tuple(
+                (axis, line, count)
+                for axis in (0, 1)
+                for line, count in Counter(c[axis] for c in combo).items()
+            )
+            halo = frozenset(n for c in combo for n in self._neighbors[c]).difference(area)
+            multi = tuple(line for line in lines if line[2] > 1)
+            placements.append(_Placement(frozenset(combo), lines, multi, halo))
+
+        return placements
+
+    def _check_placements(self, unit_id, area, stars, unknown):
+        """Intersect the area's still valid placements, inside and outside of the area"""
+
+        empty = frozenset(c for c in area if self._solution[c[0]][c[1]] is False)
+        stars = frozenset(stars)
+
+        # stars outside the area in each line it spans
+        outside = tuple(
+            {
+                line: [c for c in cells if self._solution[c[0]][c[1]]]
+                for line, cells in lines.items()
+            }
+            for lines in self._area_lines[unit_id]
+        )
+
+        previous = self._live[unit_id]
+        live = [
+            p
+            for p in previous
+            if stars <= p.cells
+            and p.cells.isdisjoint(empty)
+            and all(
+                len(outside[axis][line]) + count <= self._board.stars
+                for axis, line, count in p.multi
+            )
+        ]
+        self._live[unit_id] = live
+
+        # only what was read above: the area's known cells and the stars in its lines
+        support = self._support(c for c in area if c not in unknown).union(
+            *(self._support(cells) for lines in outside for cells in lines.values())
+        )
+
+        if not live:
+            if previous:
+                self._conflict(area[0], "area has no valid placement", support)
+            return
+
+        always = frozenset.intersection(*(p.cells for p in live))
+        ever = frozenset.union(*(p.cells for p in live))
+
+        # cells outside the area that no placement leaves open
+        blocked = None
+        for p in live:
+            cells = set(p.halo)
+            for axis, line, count in p.lines:
+                if len(outside[axis][line]) + count == self._board.stars:
+                    cells.update(self._area_lines[unit_id][axis][line])
+            blocked = cells if blocked is None else blocked & cells
+            if not blocked:
+                break
+
+        for c in unknown:
+            if c in always:
+                self._set(c, True, "area placements", support)
+            elif c not in ever:
+                self._set(c, False, "area placements", support)
+        for c in blocked:
+            if self._solution[c[0]][c[1]] is None:
+                self._set(c, False, "area placements", support)
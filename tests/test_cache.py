@@ -0,0 +1,73 @@
+import pytest
+
+from star_battle import Board, SolutionCache, get_local_puzzle
+from star_battle.board import SYMMETRIES
+from star_battle.solver import Solution
+
+
+def transformed(puzzle_data, transform):
+    """Puzzle data with layout and solution moved through a symmetry"""
+
+    size = puzzle_data["height"]
+    puzz = [[None] * size for _ in range(size)]
+    solved = [[None] * size for _ in range(size)]
+    for k, (p, s) in enumerate(zip(puzzle_data["puzz"], puzzle_data["solved"])):
+        r, c = transform(k // size, k % size, size)
+        puzz[r][c] = p
+        solved[r][c] = s
+
+    return dict(
+        puzzle_data,
+        puzz="".join(map("".join, puzz)),
+        solved="".join(map("".join, solved)),
+    )
+
+
+def known_solution(board):
+    return Solution(board, [list(row) for row in board.solution])
+
+
+@pytest.mark.parametrize("transform", SYMMETRIES)
+def test_hit_on_symmetric_board(transform):
+    data = get_local_puzzle(3)
+    board = Board.from_krazydad(data)
+    cache = SolutionCache()
+    cache.put(board, known_solution(board))
+
+    other = Board.from_krazydad(transformed(data, transform))
+    solution = cache.get(other)
+
+    assert solution is not None
+    other.check_solution(solution)
+
+
+def test_lru_eviction():
+    boards = [Board.from_krazydad(get_local_puzzle(num)) for num in (1, 2, 3)]
+    cache = SolutionCache(max_size=2)
+    cache.put(boards[0], known_solution(boards[0]))
+    cache.put(boards[1], known_solution(boards[1]))
+
+    # touch the oldest so the other one is evicted
+    assert cache.get(boards[0]) is not None
+    cache.put(boards[2], known_solution(boards[2]))
+
+    assert len(cache) == 2
+    assert cache.get(boards[1]) is None
+    assert cache.get(boards[0]) is not None
+    assert cache.get(boards[2]) is not None
+
+
+def test_json_round_trip(tmp_path):
+    path = tmp_path / "cache.json"
+    boards = [Board.from_krazydad(get_local_puzzle(num)) for num in (1, 3)]
+    cache = SolutionCache(path)
+    for board in boards:
+        cache.put(board, known_solution(board))
+
+    loaded = SolutionCache(path)
+    assert len(loaded) == 2
+    for board in boards:
+        board.check_solution(loaded.get(board))
+
+    # a smaller bound on load keeps the most recent entries
+    assert SolutionCache(path, max_size=1).get(boards[0]) is None
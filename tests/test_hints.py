@@ -0,0 +1,215 @@
+import itertools
+import random
+import statistics
+import time
+
+import pytest
+
+from star_battle import Board, HintSession, get_local_puzzle
+
+
+def generated_board(size=14, stars=2, seed=0):
+    """Random valid board: each row's stars seed an area, then areas grow to fill the grid"""
+
+    rng = random.Random(seed)
+    row_options = [
+        combo
+        for combo in itertools.combinations(range(size), stars)
+        if all(b - a > 1 for a, b in zip(combo, combo[1:]))
+    ]
+
+    def place_rows(rows, col_counts):
+        if len(rows) == size:
+            return rows
+
+        options = [
+            combo
+            for combo in row_options
+            if all(col_counts[c] < stars for c in combo)
+            and not (rows and any(abs(c - p) <= 1 for c in combo for p in rows[-1]))
+        ]
+        rng.shuffle(options)
+        for combo in options:
+            counts = list(col_counts)
+            for c in combo:
+                counts[c] += 1
+            found = place_rows(rows + [combo], counts)
+            if found:
+                return found
+
+        return None
+
+    star_cols = place_rows([], [0] * size)
+
+    labels = [[None] * size for _ in range(size)]
+    for r, combo in enumerate(star_cols):
+        for c in range(min(combo), max(combo) + 1):
+            labels[r][c] = r
+
+    unlabeled = sum(label is None for row in labels for label in row)
+    while unlabeled:
+        r, c = rng.randrange(size), rng.randrange(size)
+        if labels[r][c] is not None:
+            continue
+        for x, y in rng.sample([(-1, 0), (1, 0), (0, -1), (0, 1)], 4):
+            if 0 <= r + x < size and 0 <= c + y < size and labels[r + x][c + y] is not None:
+                labels[r][c] = labels[r + x][c + y]
+                unlabeled -= 1
+                break
+
+    return Board.from_krazydad(
+        {
+            "height": size,
+            "stars": stars,
+            "puzz": "".join(chr(ord("A") + label) for row in labels for label in row),
+            "solved": "".join(
+                "1" if c in star_cols[r] else "0" for r in range(size) for c in range(size)
+            ),
+        }
+    )
+
+
+def known_cells(session):
+    solution = session.solution
+    return {
+        (i, j, solution[i][j]) for i, j in solution.cell_index_iter if solution[i][j] is not None
+    }
+
+
+@pytest.mark.parametrize("num", [2, 3])
+def test_following_hints_solves(num):
+    board = Board.from_krazydad(get_local_puzzle(num))
+    session = HintSession(board)
+
+    while True:
+        hint = session.hint()
+        if hint is None:
+            break
+        assert not hint.conflict
+        assert hint.value == board.solution[hint.row][hint.col]
+        session.place(hint.row, hint.col, hint.value)
+
+    assert session.solution.verify()
+
+
+@pytest.mark.parametrize("num", [1, 2, 3, 4])
+def test_remove_keeps_superset_of_fresh_session(num):
+    board = Board.from_krazydad(get_local_puzzle(num))
+    rng = random.Random(num)
+    stars = [(i, j) for i, j in board.cell_index_iter if board.solution[i][j]]
+    rng.shuffle(stars)
+
+    session = HintSession(board)
+    for cell in stars[: len(stars) // 2]:
+        session.place(*cell)
+
+    for cell in stars[: len(stars) // 4]:
+        session.remove(*cell)
+        fresh = HintSession(board)
+        for c, v in session.placements.items():
+            if fresh.solution[c[0]][c[1]] is None:
+                fresh.place(*c, v)
+
+        assert known_cells(session) >= known_cells(fresh)
+
+
+@pytest.mark.parametrize("num", [1, 4])
+def test_place_then_remove_restores_state(num):
+    board = Board.from_krazydad(get_local_puzzle(num))
+    session = HintSession(board)
+    before = known_cells(session)
+
+    star = next(
+        (i, j)
+        for i, j in board.cell_index_iter
+        if board.solution[i][j] and session.solution[i][j] is None
+    )
+    session.place(*star)
+    session.remove(*star)
+
+    assert known_cells(session) == before
+
+
+def test_wrong_placement_is_reported():
+    board = Board.from_krazydad(get_local_puzzle(4))
+    session = HintSession(board)
+
+    for i, j in board.cell_index_iter:
+        if not board.solution[i][j] and session.solution[i][j] is None:
+            session.place(i, j)
+            if session.conflicts:
+                break
+            session.remove(i, j)
+
+    assert session.conflicts
+    hint = session.hint()
+    assert hint.conflict
+    assert (hint.row, hint.col) in session.placements
+
+
+def test_unit_that_cannot_fit_its_stars_is_reported():
+    board = Board.from_krazydad(get_local_puzzle(1))
+    session = HintSession(board)
+    session.place(4, 1, False)
+    session.place(1, 7, True)
+
+    assert session.conflicts
+    hint = session.hint()
+    assert hint.conflict
+    assert (hint.row, hint.col) in session.placements
+
+
+def test_place_contradicting_known_cell_raises():
+    board = Board.from_krazydad(get_local_puzzle(2))
+    session = HintSession(board)
+    session.place(*next(c for c in board.cell_index_iter if board.solution[c[0]][c[1]]))
+
+    i, j, value = next(iter(known_cells(session) - {(i, j, True) for i, j in session.placements}))
+    with pytest.raises(ValueError):
+        session.place(i, j, not value)
+
+
+def test_remove_unplaced_raises():
+    board = Board.from_krazydad(get_local_puzzle(2))
+    session = HintSession(board)
+
+    with pytest.raises(ValueError):
+        session.remove(0, 0)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_latency_14x14(seed):
+    """Hints after a change on 14x14 boards
+
+    Reading a hint back is expected well under a millisecond and a change plus hint around one;
+    the bounds leave a wide margin so loaded machines don't fail this.
+    """
+
+    board = generated_board(seed=seed)
+    session = HintSession(board)
+    stars = [(i, j) for i, j in board.cell_index_iter if board.solution[i][j]]
+    random.Random(seed).shuffle(stars)
+
+    def timed(change, *args):
+        start = time.perf_counter()
+        change(*args)
+        hint = session.hint()
+        return hint, time.perf_counter() - start
+
+    place_times = []
+    for cell in stars:
+        hint, elapsed = timed(session.place, *cell)
+        place_times.append(elapsed)
+        if hint is not None:
+            # deductions are sound, so they agree with the generated solution
+            assert hint.value == board.solution[hint.row][hint.col]
+
+        # hints don't change state, best of a few
+        assert min(timed(lambda: None)[1] for _ in range(3)) < 5e-3
+
+    assert session.solution.verify()
+
+    remove_times = [timed(session.remove, *cell)[1] for cell in stars if cell in session.placements]
+
+    assert statistics.median(place_times) < 10e-3
+    assert statistics.median(remove_times) < 10e-3